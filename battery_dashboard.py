@@ -1,10 +1,18 @@
 import streamlit as st
-import random
+import functools
 import time
+import uuid
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
 from datetime import datetime
+from streamlit_autorefresh import st_autorefresh
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; cell updates fall back to NumPy
+    njit = None
 
 # Page configuration
 st.set_page_config(
@@ -15,7 +23,7 @@ st.set_page_config(
 )
 
 # Custom CSS for better styling
-st.markdown("""
+_CSS = """
 <style>
     .main > div {
         padding-top: 2rem;
@@ -47,6 +55,21 @@ st.markdown("""
         color: white;
         margin: 0.5rem 0;
     }
+    .cell-grid {
+        display: grid;
+        grid-template-columns: repeat(4, 1fr);
+        gap: 1rem;
+    }
+    .soc-bar {
+        background: #eee;
+        border-radius: 4px;
+        height: 8px;
+    }
+    .soc-bar-fill {
+        background: #4caf50;
+        border-radius: 4px;
+        height: 100%;
+    }
     .status-badge {
         padding: 0.25rem 0.75rem;
         border-radius: 1rem;
@@ -66,55 +89,120 @@ st.markdown("""
         color: white;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# Cell card markup, kept on unindented lines so markdown does not treat it as a code block
+_CARD_TMPL = (
+    '<div class="{card_class}">'
+    '<h4 style="margin-top: 0;">{title}</h4>'
+    '<span class="status-badge {badge_class}">{status}</span>'
+    '<hr style="border-color: rgba(255,255,255,0.3);">'
+    '<p><strong>Voltage:</strong> {voltage:.2f}V</p>'
+    '<p><strong>Current:</strong> {current:.2f}A</p>'
+    '<p><strong>Temperature:</strong> {temp:.1f}°C</p>'
+    '<p><strong>SOC:</strong> {soc:.1f}%</p>'
+    '<p><strong>Capacity:</strong> {capacity:.2f}Wh</p>'
+    '<div class="soc-bar"><div class="soc-bar-fill" style="width: {soc:.1f}%;"></div></div>'
+    '</div>'
+).format_map
+
+# Cell specifications by chemistry (treat as read-only)
+CELL_SPECS = {
+    "lfp": {
+        "nominal_voltage": 3.2,
+        "min_voltage": 2.8,
+        "max_voltage": 3.6,
+        "nominal_capacity": 100  # Ah
+    },
+    "nmc": {
+        "nominal_voltage": 3.6,
+        "min_voltage": 3.2,
+        "max_voltage": 4.0,
+        "nominal_capacity": 120  # Ah
+    },
+    "lto": {
+        "nominal_voltage": 3.7,
+        "min_voltage": 3.0,
+        "max_voltage": 4.2,
+        "nominal_capacity": 110  # Ah
+    },
+}
+DEFAULT_SPECS = CELL_SPECS["lto"]
+
+# Status label and card/badge styles, indexed by status code (charging, discharging, idle)
+STATUS_LABELS = np.array(["Charging", "Discharging", "Idle"])
+CARD_CLASSES = np.array(["charging-card", "discharging-card", "idle-card"])
+BADGE_CLASSES = np.array(["charging-badge", "discharging-badge", "idle-badge"])
+
+# Shared random generator for the cell simulation
+_RNG = np.random.default_rng()
+
+# Cell array fields recorded in the history buffer, with their display names
+HISTORY_FIELDS = {
+    "voltage": "Voltage (V)",
+    "current": "Current (A)",
+    "temp": "Temperature (°C)",
+    "soc": "SOC (%)",
+    "capacity": "Capacity (Wh)",
+}
+
+# Maximum number of samples drawn per history trace
+MAX_HISTORY_POINTS = 2000
+
+# Cell array fields shown on the analytics page, with their display names
+ANALYTICS_COLUMNS = {
+    "voltage": "Voltage",
+    "current": "Current",
+    "temp": "Temperature",
+    "soc": "SOC",
+    "capacity": "Capacity",
+    "cell_type": "Type",
+}
+
+# Analytics results kept in the server-wide st.cache_data store (shared by all sessions)
+ANALYTICS_CACHE_ENTRIES = 64
+
+@st.cache_resource
+def _inject_css():
+    """Emit the custom CSS (cached, replayed on reruns)"""
+    st.markdown(_CSS, unsafe_allow_html=True)
 
 def initialize_session_state():
     """Initialize session state variables"""
-    if 'cells_data' not in st.session_state:
-        st.session_state.cells_data = {}
+    if 'cells_df' not in st.session_state:
+        st.session_state.cells_df = pd.DataFrame()
+    if 'cells_id' not in st.session_state:
+        st.session_state.cells_id = None
+    if 'cells_version' not in st.session_state:
+        st.session_state.cells_version = 0
+    if 'cell_names' not in st.session_state:
+        st.session_state.cell_names = []
+    if 'current_editor_rev' not in st.session_state:
+        st.session_state.current_editor_rev = 0
     if 'cell_types' not in st.session_state:
         st.session_state.cell_types = []
     if 'history' not in st.session_state:
-        st.session_state.history = []
+        st.session_state.history = np.empty((0, 0, len(HISTORY_FIELDS)))
+    if 'history_times' not in st.session_state:
+        st.session_state.history_times = np.empty(0)
+    if 'history_len' not in st.session_state:
+        st.session_state.history_len = 0
     if 'setup_complete' not in st.session_state:
         st.session_state.setup_complete = False
 
+@functools.lru_cache(maxsize=4)
 def get_cell_specs(cell_type):
     """Get cell specifications based on type"""
-    if cell_type.lower() == "lfp":
-        return {
-            "nominal_voltage": 3.2,
-            "min_voltage": 2.8,
-            "max_voltage": 3.6,
-            "nominal_capacity": 100  # Ah
-        }
-    elif cell_type.lower() == "nmc":
-        return {
-            "nominal_voltage": 3.6,
-            "min_voltage": 3.2,
-            "max_voltage": 4.0,
-            "nominal_capacity": 120  # Ah
-        }
-    else:
-        return {
-            "nominal_voltage": 3.7,
-            "min_voltage": 3.0,
-            "max_voltage": 4.2,
-            "nominal_capacity": 110  # Ah
-        }
+    return CELL_SPECS.get(cell_type.lower(), DEFAULT_SPECS)
 
 def calculate_soc_percentage(voltage, min_voltage, max_voltage):
-    """Calculate State of Charge percentage based on voltage"""
-    return max(0, min(100, ((voltage - min_voltage) / (max_voltage - min_voltage)) * 100))
-
-def get_cell_status(current):
-    """Determine cell status based on current"""
-    if current > 0.1:
-        return "Charging", "charging"
-    elif current < -0.1:
-        return "Discharging", "discharging"
-    else:
-        return "Idle", "idle"
+    """Calculate State of Charge percentage based on voltage (scalars or arrays)"""
+    return np.clip((voltage - min_voltage) / (max_voltage - min_voltage) * 100, 0, 100)
+
+def get_cell_status_codes(current):
+    """Determine cell status codes (index into STATUS_LABELS) based on current"""
+    current = np.asarray(current)
+    return np.select([current > 0.1, current < -0.1], [0, 1], default=2)
 
 def setup_cells():
     """Setup cells configuration"""
@@ -145,33 +233,34 @@ def setup_cells():
             cell_types.append(cell_type)
     
     if st.button("Initialize Cells", type="primary"):
-        cells_data = {}
+        # One row per cell, starting from the specs of its type
+        cell_keys = [f"cell_{idx}_{cell_type.lower()}" for idx, cell_type in enumerate(cell_types, start=1)]
+        cells_df = pd.DataFrame.from_records(
+            [get_cell_specs(cell_type) for cell_type in cell_types],
+            index=pd.Index(cell_keys, name='cell_key')
+        )
+        n = len(cells_df)
         
-        for idx, cell_type in enumerate(cell_types, start=1):
-            cell_key = f"cell_{idx}_{cell_type.lower()}"
-            specs = get_cell_specs(cell_type)
-            
-            # Initialize with random values
-            voltage = round(random.uniform(specs["min_voltage"], specs["max_voltage"]), 2)
-            current = 0.0
-            temp = round(random.uniform(25, 40), 1)
-            capacity = round(voltage * abs(current), 2)
-            soc = calculate_soc_percentage(voltage, specs["min_voltage"], specs["max_voltage"])
-            
-            cells_data[cell_key] = {
-                "voltage": voltage,
-                "current": current,
-                "temp": temp,
-                "capacity": capacity,
-                "min_voltage": specs["min_voltage"],
-                "max_voltage": specs["max_voltage"],
-                "nominal_voltage": specs["nominal_voltage"],
-                "nominal_capacity": specs["nominal_capacity"],
-                "soc": soc,
-                "cell_type": cell_type.upper()
-            }
+        # Initialize all cells with random values in one pass
+        cells_df['voltage'] = np.round(_RNG.uniform(cells_df['min_voltage'], cells_df['max_voltage']), 2)
+        cells_df['current'] = 0.0
+        cells_df['temp'] = np.round(_RNG.uniform(25, 40, size=n), 1)
+        cells_df['capacity'] = np.round(cells_df['voltage'] * cells_df['current'].abs(), 2)
+        cells_df['soc'] = calculate_soc_percentage(
+            cells_df['voltage'], cells_df['min_voltage'], cells_df['max_voltage']
+        )
+        cells_df['cell_type'] = [cell_type.upper() for cell_type in cell_types]
         
-        st.session_state.cells_data = cells_data
+        st.session_state.cells_df = cells_df
+        st.session_state.cells_id = uuid.uuid4().hex
+        st.session_state.cells_version = 0
+        reset_current_editor()
+        # Display labels are fixed for the life of the setup, so format them once
+        st.session_state.cell_names = [key.replace('_', ' ').title() for key in cell_keys]
+        st.session_state.history = np.empty((0, n, len(HISTORY_FIELDS)))
+        st.session_state.history_times = np.empty(0)
+        st.session_state.history_len = 0
+        record_history()
         st.session_state.cell_types = cell_types
         st.session_state.setup_complete = True
         st.success(f"Successfully initialized {num_cells} cells!")
@@ -184,10 +273,11 @@ def display_cell_cards():
     # Summary metrics
     col1, col2, col3, col4 = st.columns(4)
     
-    total_cells = len(st.session_state.cells_data)
-    charging_cells = sum(1 for cell in st.session_state.cells_data.values() if cell['current'] > 0.1)
-    discharging_cells = sum(1 for cell in st.session_state.cells_data.values() if cell['current'] < -0.1)
-    avg_temp = sum(cell['temp'] for cell in st.session_state.cells_data.values()) / total_cells if total_cells > 0 else 0
+    df = st.session_state.cells_df
+    total_cells = len(df)
+    charging_cells = int(df['current'].gt(0.1).sum())
+    discharging_cells = int(df['current'].lt(-0.1).sum())
+    avg_temp = float(df['temp'].mean()) if total_cells > 0 else 0
     
     with col1:
         st.metric("Total Cells", total_cells)
@@ -201,44 +291,24 @@ def display_cell_cards():
     # Cell cards
     st.subheader("Individual Cell Status")
     
-    # Create columns for cards (4 cards per row)
-    cells_list = list(st.session_state.cells_data.items())
-    rows = [cells_list[i:i+4] for i in range(0, len(cells_list), 4)]
+    # Status label and card/badge styles for all cells at once
+    codes = get_cell_status_codes(df['current'].to_numpy())
+    card_rows = df.assign(
+        title=st.session_state.cell_names,
+        status=STATUS_LABELS[codes],
+        card_class=CARD_CLASSES[codes],
+        badge_class=BADGE_CLASSES[codes],
+    ).to_dict('records')
     
-    for row in rows:
-        cols = st.columns(len(row))
-        
-        for idx, (cell_key, cell_data) in enumerate(row):
-            with cols[idx]:
-                status, status_class = get_cell_status(cell_data['current'])
-                
-                # Determine card style based on status
-                if status_class == "charging":
-                    card_class = "charging-card"
-                    badge_class = "charging-badge"
-                elif status_class == "discharging":
-                    card_class = "discharging-card"
-                    badge_class = "discharging-badge"
-                else:
-                    card_class = "idle-card"
-                    badge_class = "idle-badge"
-                
-                # Create card content
-                st.markdown(f"""
-                <div class="{card_class}">
-                    <h4 style="margin-top: 0;">{cell_key.replace('_', ' ').title()}</h4>
-                    <span class="status-badge {badge_class}">{status}</span>
-                    <hr style="border-color: rgba(255,255,255,0.3);">
-                    <p><strong>Voltage:</strong> {cell_data['voltage']:.2f}V</p>
-                    <p><strong>Current:</strong> {cell_data['current']:.2f}A</p>
-                    <p><strong>Temperature:</strong> {cell_data['temp']:.1f}°C</p>
-                    <p><strong>SOC:</strong> {cell_data['soc']:.1f}%</p>
-                    <p><strong>Capacity:</strong> {cell_data['capacity']:.2f}Wh</p>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                # Progress bar for SOC
-                st.progress(cell_data['soc'] / 100)
+    # All cards go out as a single HTML grid (4 cards per row)
+    cards = "".join(_CARD_TMPL(row) for row in card_rows)
+    st.markdown(f'<div class="cell-grid">{cards}</div>', unsafe_allow_html=True)
+
+def reset_current_editor():
+    """Discard pending edits in the current grid (call after replacing all currents)"""
+    # The grid keeps its edits while its key and columns stay the same, even when the
+    # values change, so a new key is the only way to stop them being re-applied
+    st.session_state.current_editor_rev += 1
 
 def control_panel():
     """Control panel for updating cell values"""
@@ -251,146 +321,260 @@ def control_panel():
         col1, col2, col3, col4 = st.columns(4)
         with col1:
             if st.button("🔋 Start Charging (+2A)"):
-                for cell_key in st.session_state.cells_data:
-                    st.session_state.cells_data[cell_key]['current'] = 2.0
-                    update_cell_calculations(cell_key)
+                st.session_state.cells_df['current'] = 2.0
+                _recompute_all(st.session_state.cells_df)
+                st.session_state.cells_version += 1
+                reset_current_editor()
+                record_history()
                 st.rerun()
         
         with col2:
             if st.button("⚡ Fast Charge (+5A)"):
-                for cell_key in st.session_state.cells_data:
-                    st.session_state.cells_data[cell_key]['current'] = 5.0
-                    update_cell_calculations(cell_key)
+                st.session_state.cells_df['current'] = 5.0
+                _recompute_all(st.session_state.cells_df)
+                st.session_state.cells_version += 1
+                reset_current_editor()
+                record_history()
                 st.rerun()
         
         with col3:
             if st.button("🔻 Discharge (-2A)"):
-                for cell_key in st.session_state.cells_data:
-                    st.session_state.cells_data[cell_key]['current'] = -2.0
-                    update_cell_calculations(cell_key)
+                st.session_state.cells_df['current'] = -2.0
+                _recompute_all(st.session_state.cells_df)
+                st.session_state.cells_version += 1
+                reset_current_editor()
+                record_history()
                 st.rerun()
         
         with col4:
             if st.button("⏸️ Stop All (0A)"):
-                for cell_key in st.session_state.cells_data:
-                    st.session_state.cells_data[cell_key]['current'] = 0.0
-                    update_cell_calculations(cell_key)
+                st.session_state.cells_df['current'] = 0.0
+                _recompute_all(st.session_state.cells_df)
+                st.session_state.cells_version += 1
+                reset_current_editor()
+                record_history()
                 st.rerun()
         
         st.divider()
         
-        # Individual cell controls
+        # Individual cell controls (one editable grid for all cells)
         st.subheader("Individual Cell Controls")
-        cells_per_row = 4
-        cell_keys = list(st.session_state.cells_data.keys())
+        df = st.session_state.cells_df
+        currents = df['current'].to_numpy()
+        edited = st.data_editor(
+            pd.DataFrame(
+                {'current': currents},
+                index=pd.Index(st.session_state.cell_names, name='Cell')
+            ),
+            num_rows='fixed',
+            key=f'current_editor_{st.session_state.current_editor_rev}',
+            column_config={
+                'current': st.column_config.NumberColumn(
+                    "Current (A)",
+                    min_value=-10.0,
+                    max_value=10.0,
+                    step=0.1,
+                    required=True,
+                    help="Positive = Charging, Negative = Discharging"
+                )
+            },
+            use_container_width=True
+        )
         
-        for i in range(0, len(cell_keys), cells_per_row):
-            cols = st.columns(cells_per_row)
-            row_cells = cell_keys[i:i+cells_per_row]
-            
-            for idx, cell_key in enumerate(row_cells):
-                with cols[idx]:
-                    current_val = st.number_input(
-                        f"{cell_key.replace('_', ' ').title()}",
-                        min_value=-10.0,
-                        max_value=10.0,
-                        value=st.session_state.cells_data[cell_key]['current'],
-                        step=0.1,
-                        key=f"current_{cell_key}",
-                        help="Positive = Charging, Negative = Discharging"
-                    )
-                    
-                    if current_val != st.session_state.cells_data[cell_key]['current']:
-                        st.session_state.cells_data[cell_key]['current'] = current_val
-                        update_cell_calculations(cell_key)
-
-def update_cell_calculations(cell_key):
-    """Update cell calculations based on current"""
-    cell_data = st.session_state.cells_data[cell_key]
-    
-    # Update capacity (simplified calculation)
-    cell_data['capacity'] = round(cell_data['voltage'] * abs(cell_data['current']), 2)
-    
-    # Simulate voltage change based on current (simplified model)
-    if cell_data['current'] > 0:  # Charging
-        voltage_change = min(0.1, cell_data['current'] * 0.02)
-        cell_data['voltage'] = min(cell_data['max_voltage'], 
-                                 cell_data['voltage'] + voltage_change)
-    elif cell_data['current'] < 0:  # Discharging
-        voltage_change = min(0.1, abs(cell_data['current']) * 0.02)
-        cell_data['voltage'] = max(cell_data['min_voltage'], 
-                                 cell_data['voltage'] - voltage_change)
-    
-    # Update SOC
-    cell_data['soc'] = calculate_soc_percentage(
-        cell_data['voltage'], 
-        cell_data['min_voltage'], 
-        cell_data['max_voltage']
-    )
+        # Apply all changed currents in one update
+        new_currents = edited['current'].to_numpy()
+        changed_mask = new_currents != currents
+        if changed_mask.any():
+            df.loc[changed_mask, 'current'] = new_currents[changed_mask]
+            _recompute_all(df, mask=changed_mask)
+            st.session_state.cells_version += 1
+            record_history()
+
+def _update_cells_kernel(voltage, current, temp, capacity, soc,
+                         min_voltage, max_voltage, temp_noise):
+    """Per-cell update loop over raw arrays (in place), compiled with numba"""
+    for k in range(voltage.shape[0]):
+        # Update capacity (simplified calculation)
+        capacity[k] = voltage[k] * abs(current[k])
+        
+        # Simulate voltage change based on current, capped at 0.1V per update
+        voltage_change = min(0.1, abs(current[k]) * 0.02)
+        if current[k] > 0:
+            voltage[k] = min(max_voltage[k], voltage[k] + voltage_change)
+        elif current[k] < 0:
+            voltage[k] = max(min_voltage[k], voltage[k] - voltage_change)
+        
+        # Update SOC
+        level = (voltage[k] - min_voltage[k]) / (max_voltage[k] - min_voltage[k]) * 100.0
+        soc[k] = min(100.0, max(0.0, level))
+        
+        # Simulate temperature change
+        if abs(current[k]) > 1.0:
+            temp[k] = min(60.0, max(20.0, temp[k] + temp_noise[k]))
+
+@st.cache_resource
+def _compiled_update_kernel():
+    """JIT-compile the cell update kernel once per process (None without numba)"""
+    if njit is None:
+        return None
+    kernel = njit(cache=True, fastmath=True)(_update_cells_kernel)
+    # Warm up with one dummy cell so the first real update is not charged the compile
+    one, zero = np.ones(1), np.zeros(1)
+    kernel(one.copy(), one, one.copy(), one.copy(), one.copy(), zero, one + 1, zero)
+    return kernel
+
+def _recompute_all(df, mask=None):
+    """Update calculations for the cells selected by mask (all cells by default)"""
+    rows = df.index if mask is None else df.index[np.asarray(mask)]
+    cells = df.loc[rows]
+    current = cells['current'].to_numpy(dtype=float)
+    voltage = cells['voltage'].to_numpy(dtype=float, copy=True)
+    min_voltage = cells['min_voltage'].to_numpy(dtype=float)
+    max_voltage = cells['max_voltage'].to_numpy(dtype=float)
+    temp = cells['temp'].to_numpy(dtype=float, copy=True)
+    temp_noise = _RNG.uniform(-1, 2, size=len(rows))
     
-    # Simulate temperature change
-    if abs(cell_data['current']) > 1:
-        temp_change = random.uniform(-1, 2)
-        cell_data['temp'] = max(20, min(60, cell_data['temp'] + temp_change))
+    kernel = _compiled_update_kernel()
+    if kernel is not None:
+        capacity = np.empty_like(voltage)
+        soc = np.empty_like(voltage)
+        kernel(voltage, current, temp, capacity, soc, min_voltage, max_voltage, temp_noise)
+    else:
+        # Update capacity (simplified calculation)
+        capacity = voltage * np.abs(current)
+        
+        # Simulate voltage change based on current, capped at 0.1V per update
+        voltage_change = np.clip(current * 0.02, -0.1, 0.1)
+        voltage = np.clip(voltage + voltage_change, min_voltage, max_voltage)
+        
+        # Update SOC
+        soc = calculate_soc_percentage(voltage, min_voltage, max_voltage)
+        
+        # Simulate temperature change
+        hot = np.abs(current) > 1
+        temp[hot] = np.clip(temp[hot] + temp_noise[hot], 20, 60)
+    
+    # Quantize displayed values in place
+    np.round(capacity, 2, out=capacity)
+    np.round(temp, 1, out=temp)
+    
+    df.loc[rows, 'capacity'] = capacity
+    df.loc[rows, 'voltage'] = voltage
+    df.loc[rows, 'soc'] = soc
+    df.loc[rows, 'temp'] = temp
+
+def record_history():
+    """Append the current cell values to the history buffer"""
+    df = st.session_state.cells_df
+    n = st.session_state.history_len
+    history = st.session_state.history
+    
+    # Grow by doubling so appends stay O(1) amortized
+    if n == len(history):
+        grown = np.empty((max(2 * n, 64),) + history.shape[1:])
+        grown[:n] = history[:n]
+        grown_times = np.empty(len(grown))
+        grown_times[:n] = st.session_state.history_times[:n]
+        st.session_state.history = history = grown
+        st.session_state.history_times = grown_times
+    
+    history[n] = df[list(HISTORY_FIELDS)].to_numpy()
+    st.session_state.history_times[n] = time.time()
+    st.session_state.history_len = n + 1
+
+def cells_cache_key():
+    """Cache key for the current cell values: (setup id, change counter)"""
+    # The setup id keeps sessions apart, since st.cache_data is shared between them
+    return (st.session_state.cells_id, st.session_state.cells_version)
+
+@st.cache_data(show_spinner=False, max_entries=ANALYTICS_CACHE_ENTRIES)
+def _build_analytics_df(cells_key, _cells_df, _cell_names):
+    """Build the analytics DataFrame (cached per cells_key)"""
+    df = _cells_df[list(ANALYTICS_COLUMNS)].rename(columns=ANALYTICS_COLUMNS).reset_index(drop=True)
+    df.insert(0, 'Cell', _cell_names)
+    return df
+
+@st.cache_data(show_spinner=False, max_entries=ANALYTICS_CACHE_ENTRIES)
+def _build_metrics_figure(cells_key, _df):
+    """Build one faceted bar chart of all charted metrics (cached per cells_key)"""
+    df_long = _df.melt(
+        id_vars=['Cell', 'Type'],
+        value_vars=['Voltage', 'Current', 'SOC', 'Temperature'],
+        var_name='Metric',
+        value_name='Value'
+    )
+    fig = px.bar(df_long, x='Cell', y='Value', color='Type',
+                 facet_col='Metric', facet_col_wrap=2, facet_row_spacing=0.15,
+                 title='Cell Metrics', height=800)
+    fig.update_yaxes(matches=None, showticklabels=True)
+    fig.update_xaxes(tickangle=-45)
+    fig.for_each_annotation(lambda a: a.update(text=a.text.split('=')[-1]))
+    return fig
 
 def analytics_dashboard():
     """Analytics and visualization dashboard"""
     st.header("📈 Analytics Dashboard")
     
-    if not st.session_state.cells_data:
+    if st.session_state.cells_df.empty:
         st.warning("No cell data available. Please initialize cells first.")
         return
     
-    # Create DataFrame for easier plotting
-    df_data = []
-    for cell_key, cell_data in st.session_state.cells_data.items():
-        df_data.append({
-            'Cell': cell_key.replace('_', ' ').title(),
-            'Voltage': cell_data['voltage'],
-            'Current': cell_data['current'],
-            'Temperature': cell_data['temp'],
-            'SOC': cell_data['soc'],
-            'Capacity': cell_data['capacity'],
-            'Type': cell_data['cell_type']
-        })
-    
-    df = pd.DataFrame(df_data)
-    
-    # Charts
-    col1, col2 = st.columns(2)
+    # DataFrame and figures are cached until a cell value changes
+    cells_key = cells_cache_key()
+    df = _build_analytics_df(cells_key, st.session_state.cells_df, st.session_state.cell_names)
     
-    with col1:
-        # Voltage comparison
-        fig_voltage = px.bar(df, x='Cell', y='Voltage', color='Type',
-                           title='Cell Voltages', height=400)
-        fig_voltage.update_layout(xaxis_tickangle=-45)
-        st.plotly_chart(fig_voltage, use_container_width=True)
-        
-        # Current comparison
-        fig_current = px.bar(df, x='Cell', y='Current', color='Type',
-                           title='Cell Currents (A)', height=400)
-        fig_current.update_layout(xaxis_tickangle=-45)
-        st.plotly_chart(fig_current, use_container_width=True)
-    
-    with col2:
-        # SOC comparison
-        fig_soc = px.bar(df, x='Cell', y='SOC', color='Type',
-                        title='State of Charge (%)', height=400)
-        fig_soc.update_layout(xaxis_tickangle=-45)
-        st.plotly_chart(fig_soc, use_container_width=True)
-        
-        # Temperature comparison
-        fig_temp = px.bar(df, x='Cell', y='Temperature', color='Type',
-                         title='Cell Temperatures (°C)', height=400)
-        fig_temp.update_layout(xaxis_tickangle=-45)
-        st.plotly_chart(fig_temp, use_container_width=True)
+    # Charts (voltage, current, SOC and temperature in one faceted figure)
+    st.plotly_chart(_build_metrics_figure(cells_key, df), use_container_width=True)
     
     # Summary table
     st.subheader("📋 Detailed Data Table")
     st.dataframe(df, use_container_width=True, hide_index=True)
 
+def history_dashboard():
+    """Time-series view of recorded cell values"""
+    st.header("🕒 Cell History")
+    
+    n = st.session_state.history_len
+    if n == 0:
+        st.warning("No history recorded yet.")
+        return
+    
+    field = st.selectbox(
+        "Metric",
+        options=list(HISTORY_FIELDS),
+        format_func=HISTORY_FIELDS.get
+    )
+    field_idx = list(HISTORY_FIELDS).index(field)
+    
+    # Thin long histories down to at most MAX_HISTORY_POINTS samples per trace
+    step = max(1, -(-n // MAX_HISTORY_POINTS))
+    times = st.session_state.history_times[:n:step]
+    values = st.session_state.history[:n:step, :, field_idx]
+    elapsed = times - st.session_state.history_times[0]
+    
+    # WebGL traces keep rendering fast for long histories
+    fig = go.Figure()
+    for idx, cell_name in enumerate(st.session_state.cell_names):
+        fig.add_trace(go.Scattergl(
+            x=elapsed,
+            y=values[:, idx],
+            mode='lines+markers',
+            name=cell_name
+        ))
+    fig.update_layout(
+        xaxis_title='Elapsed (s)',
+        yaxis_title=HISTORY_FIELDS[field],
+        height=500
+    )
+    st.plotly_chart(fig, use_container_width=True)
+    st.caption(f"{n} samples recorded")
+
+# Compile the numba kernel (if available) before the first cell update
+_compiled_update_kernel()
+
 def main():
     """Main application function"""
+    _inject_css()
     initialize_session_state()
     
     # Sidebar
@@ -399,14 +583,13 @@ def main():
     
     page = st.sidebar.selectbox(
         "Navigation",
-        ["Setup", "Dashboard", "Control Panel", "Analytics"]
+        ["Setup", "Dashboard", "Control Panel", "Analytics", "History"]
     )
     
-    # Auto-refresh option
+    # Auto-refresh option (browser-side timer, does not block the script thread)
     auto_refresh = st.sidebar.checkbox("Auto Refresh (5s)", value=False)
     if auto_refresh:
-        time.sleep(5)
-        st.rerun()
+        st_autorefresh(interval=5000, limit=None, key="dash_refresh")
     
     # Reset button
     if st.sidebar.button("🔄 Reset All Data", type="secondary"):
@@ -434,6 +617,11 @@ def main():
             analytics_dashboard()
         else:
             st.warning("Please complete setup first.")
+    elif page == "History":
+        if st.session_state.setup_complete:
+            history_dashboard()
+        else:
+            st.warning("Please complete setup first.")
 
 if __name__ == "__main__":
     main()
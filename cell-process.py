@@ -1,104 +1,149 @@
-import random
-
-number_of_cell = int(input("Enter number of cell: "))
-list_of_cell = []
-for i in range(number_of_cell):
-    list_of_cell.append(input("Enter cell type: "))
-    
-print(list_of_cell)
-cells_data = {}
-    
-for idx, cell_type in enumerate(list_of_cell, start=1):
-    cell_key = f"cell_{idx}_{cell_type}"
-    
-    voltage = 3.2 if cell_type == "lfp" else 3.6
-    min_voltage = 2.8 if cell_type == "lfp" else 3.2
-    max_voltage = 3.6 if cell_type == "lfp" else 4.0
-    current = 0.0
-    temp = round(random.uniform(25, 40), 1)
-    capacity = round(voltage * current, 2)
-    
-    cells_data[cell_key] = {
-        "voltage": voltage,
-        "current": current,
-        "temp": temp,
-        "capacity": capacity,
-        "min_voltage": min_voltage,
-        "max_voltage": max_voltage
-    }
-    
-for key, values in cells_data.items():
-    print(f"{key}: {values}")
-
-def process_task():
-    list_task = []
-    task_dict = {}
-    
-    task_number = int(input("Enter how many tasks are there? "))
-    
-    for i in range(task_number):
-        print(f"\n--- Task {i+1} ---")
-        task = input("Input task (1) CC_CV, (2) IDLE, (3) CC_CD: ").upper()
-        list_task.append(task)
-        
-        task_key = f"task_{i+1}"
-        task_data = {}
-        
-        if task == "CC_CV" or task == "CCCV":
-            print("Enter CC_CV parameters:")
-            cc_input = input("Enter CC value (A) or CP value (W) - specify unit (e.g., '5A' or '10W'): ")
-            cv_voltage = float(input("Enter CV voltage (V): "))
-            current = float(input("Enter current (A): "))
-            capacity = float(input("Enter capacity: "))
-            time_seconds = int(input("Enter time in seconds: "))
-            
-            task_data = {
-                "task_type": "CC_CV",
-                "cc_cp": cc_input,
-                "cv_voltage": cv_voltage,
-                "current": current,
-                "capacity": capacity,
-                "time_seconds": time_seconds
-            }
-            
-        elif task == "IDLE":
-            print("Enter IDLE parameters:")
-            time_seconds = int(input("Enter time in seconds: "))
-            
-            task_data = {
-                "task_type": "IDLE",
-                "time_seconds": time_seconds
-            }
-            
-        elif task == "CC_CD":
-            print("Enter CC_CD parameters:")
-            cc_input = input("Enter CC value (A) or CP value (W) - specify unit (e.g., '5A' or '10W'): ")
-            voltage = float(input("Enter voltage (V): "))
-            capacity = float(input("Enter capacity: "))
-            time_seconds = int(input("Enter time in seconds: "))
-            
-            task_data = {
-                "task_type": "CC_CD",
-                "cc_cp": cc_input,
-                "voltage": voltage,
-                "capacity": capacity,
-                "time_seconds": time_seconds
-            }
-        else:
-            print("Invalid task type entered!")
-            task_data = {
-                "task_type": "INVALID",
-                "error": "Unknown task type"
-            }
-        
-        task_dict[task_key] = task_data
-    
-    print(f"\nList of tasks: {list_task}")
-    print("\n--- Task Dictionary ---")
-    for key, values in task_dict.items():
-        print(f"{key}: {values}")
-    
-    return list_task, task_dict
-
-if __name__ == "__main__":
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Cell parameters by type (any type other than LFP uses the NMC values)
+CELL_SPECS = {
+    "lfp": {"voltage": 3.2, "min_voltage": 2.8, "max_voltage": 3.6},
+    "nmc": {"voltage": 3.6, "min_voltage": 3.2, "max_voltage": 4.0},
+}
+DEFAULT_SPECS = CELL_SPECS["nmc"]
+
+_RNG = np.random.default_rng()
+
+# Parameters prompted for each task type: (field, type, prompt)
+_CC_CP_PROMPT = "Enter CC value (A) or CP value (W) - specify unit (e.g., '5A' or '10W'): "
+TASK_SCHEMAS = {
+    "CC_CV": [
+        ("cc_cp", str, _CC_CP_PROMPT),
+        ("cv_voltage", float, "Enter CV voltage (V): "),
+        ("current", float, "Enter current (A): "),
+        ("capacity", float, "Enter capacity: "),
+        ("time_seconds", int, "Enter time in seconds: "),
+    ],
+    "IDLE": [
+        ("time_seconds", int, "Enter time in seconds: "),
+    ],
+    "CC_CD": [
+        ("cc_cp", str, _CC_CP_PROMPT),
+        ("voltage", float, "Enter voltage (V): "),
+        ("capacity", float, "Enter capacity: "),
+        ("time_seconds", int, "Enter time in seconds: "),
+    ],
+}
+TASK_ALIASES = {"CCCV": "CC_CV"}
+# Recorded in place of a task whose type is not in TASK_SCHEMAS (copy before use)
+INVALID_TASK = {"task_type": "INVALID", "error": "Unknown task type"}
+
+def _make_reader():
+    """Return an input()-like reader; piped stdin is read once and served token by token"""
+    if sys.stdin.isatty():
+        return input
+    
+    tokens = iter(sys.stdin.read().split())
+    
+    def read_token(prompt=""):
+        try:
+            return next(tokens)
+        except StopIteration:
+            raise EOFError("not enough values on stdin") from None
+    
+    return read_token
+
+read = _make_reader()
+
+number_of_cell = int(read("Enter number of cell: "))
+list_of_cell = [read("Enter cell type: ") for _ in range(number_of_cell)]
+    
+print(list_of_cell)
+
+# Build the whole cell table at once from the type specs
+cells_df = pd.DataFrame.from_records(
+    [CELL_SPECS.get(cell_type.lower(), DEFAULT_SPECS) for cell_type in list_of_cell],
+    index=[f"cell_{idx}_{cell_type}" for idx, cell_type in enumerate(list_of_cell, start=1)],
+    columns=["voltage", "min_voltage", "max_voltage"]
+)
+cells_df["current"] = 0.0
+cells_df["temp"] = np.round(_RNG.uniform(25, 40, size=len(cells_df)), 1)
+cells_df["capacity"] = np.round(cells_df["voltage"] * cells_df["current"], 2)
+cells_df = cells_df[["voltage", "current", "temp", "capacity", "min_voltage", "max_voltage"]]
+    
+print(cells_df.to_string())
+
+def _read_task(name, schema):
+    """Prompt for the parameters of one task following its schema"""
+    print(f"Enter {name} parameters:")
+    return {"task_type": name, **{field: cast(read(prompt)) for field, cast, prompt in schema}}
+
+def _task_from_json(i, task):
+    """Validate and cast one JSON task dict against its schema"""
+    if "task_type" not in task:
+        raise ValueError(f"task {i}: missing task_type")
+    task_type = str(task["task_type"]).upper()
+    name = TASK_ALIASES.get(task_type, task_type)
+    if name not in TASK_SCHEMAS:
+        print(f"Invalid task type in task {i}: {task['task_type']}")
+        return task_type, dict(INVALID_TASK)
+    
+    schema = TASK_SCHEMAS[name]
+    missing = [field for field, _, _ in schema if field not in task]
+    if missing:
+        raise ValueError(f"task {i} ({name}): missing {', '.join(missing)}")
+    
+    task_data = {"task_type": name}
+    for field, cast, _ in schema:
+        try:
+            task_data[field] = cast(task[field])
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"task {i} ({name}): invalid {field} {task[field]!r}") from e
+    return task_type, task_data
+
+def _load_tasks_json(path):
+    """Load a list of task dicts from a JSON file, validated like interactive input"""
+    with open(path) as f:
+        tasks = json.load(f)
+    
+    list_task = []
+    task_dict = {}
+    for i, task in enumerate(tasks, start=1):
+        task_type, task_data = _task_from_json(i, task)
+        list_task.append(task_type)
+        task_dict[f"task_{i}"] = task_data
+    return list_task, task_dict
+
+def process_task():
+    # Bulk mode: TASKS_JSON points at a JSON list of task dicts
+    if path := os.environ.get("TASKS_JSON"):
+        list_task, task_dict = _load_tasks_json(path)
+    else:
+        list_task = []
+        task_dict = {}
+        
+        task_number = int(read("Enter how many tasks are there? "))
+        
+        for i in range(task_number):
+            print(f"\n--- Task {i+1} ---")
+            task = read("Input task (1) CC_CV, (2) IDLE, (3) CC_CD: ").upper()
+            list_task.append(task)
+            
+            name = TASK_ALIASES.get(task, task)
+            if name in TASK_SCHEMAS:
+                task_data = _read_task(name, TASK_SCHEMAS[name])
+            else:
+                print("Invalid task type entered!")
+                task_data = dict(INVALID_TASK)
+            
+            task_dict[f"task_{i+1}"] = task_data
+    
+    print(f"\nList of tasks: {list_task}")
+    print("\n--- Task Dictionary ---")
+    for key, values in task_dict.items():
+        print(f"{key}: {values}")
+    
+    return list_task, task_dict
+
+if __name__ == "__main__":
     task_list, tasks_dictionary = process_task()
\ No newline at end of file
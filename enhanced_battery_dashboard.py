@@ -1,12 +1,23 @@
 import streamlit as st
+import functools
 import random
 import time
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
+from plotly.subplots import make_subplots
 from datetime import datetime
+from streamlit_autorefresh import st_autorefresh
 import threading
 import json
+from collections import deque
+from dataclasses import dataclass, fields
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; cell updates fall back to NumPy
+    njit = None
 
 # Page configuration
 st.set_page_config(
@@ -17,7 +28,7 @@ st.set_page_config(
 )
 
 # Custom CSS for better styling
-st.markdown("""
+_CSS = """
 <style>
     .main > div {
         padding-top: 2rem;
@@ -57,6 +68,21 @@ st.markdown("""
         margin: 0.5rem 0;
         border: 2px solid #ff6b9d;
     }
+    .cell-grid {
+        display: grid;
+        grid-template-columns: repeat(4, 1fr);
+        gap: 1rem;
+    }
+    .soc-bar {
+        background: #eee;
+        border-radius: 4px;
+        height: 8px;
+    }
+    .soc-bar-fill {
+        background: #4caf50;
+        border-radius: 4px;
+        height: 100%;
+    }
     .status-badge {
         padding: 0.25rem 0.75rem;
         border-radius: 1rem;
@@ -80,12 +106,103 @@ st.markdown("""
         color: white;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# Cell specifications by chemistry (treat as read-only)
+CELL_SPECS = {
+    "lfp": {
+        "nominal_voltage": 3.2,
+        "min_voltage": 2.8,
+        "max_voltage": 3.6,
+        "nominal_capacity": 100  # Ah
+    },
+    "nmc": {
+        "nominal_voltage": 3.6,
+        "min_voltage": 3.2,
+        "max_voltage": 4.0,
+        "nominal_capacity": 120  # Ah
+    },
+    "lto": {
+        "nominal_voltage": 3.7,
+        "min_voltage": 3.0,
+        "max_voltage": 4.2,
+        "nominal_capacity": 110  # Ah
+    },
+}
+DEFAULT_SPECS = CELL_SPECS["lto"]
+
+# Status labels and classes by status code (charging, discharging, idle)
+_STATUS_LABELS = np.array(["Charging", "Discharging", "Idle"])
+_STATUS_CLASSES = np.array(["charging", "discharging", "idle"])
+
+# Card and badge CSS classes by status class
+_CARD_STYLES = {
+    "task": ("task-running-card", "task-badge"),
+    "charging": ("charging-card", "charging-badge"),
+    "discharging": ("discharging-card", "discharging-badge"),
+    "idle": ("idle-card", "idle-badge"),
+}
+
+# Cell card markup, kept on unindented lines so markdown does not treat it as a code block.
+# Values are passed in already formatted.
+_CARD_TMPL = (
+    '<div class="{card_class}">'
+    '<h4 style="margin-top: 0;">{name}</h4>'
+    '<span class="status-badge {badge_class}">{status}</span>'
+    '<hr style="border-color: rgba(255,255,255,0.3);">'
+    '<p><strong>Voltage:</strong> {voltage}V</p>'
+    '<p><strong>Current:</strong> {current}A</p>'
+    '<p><strong>Temperature:</strong> {temp}°C</p>'
+    '<p><strong>SOC:</strong> {soc}%</p>'
+    '<p><strong>Capacity:</strong> {capacity}Wh</p>'
+    '<div class="soc-bar"><div class="soc-bar-fill" style="width: {soc}%;"></div></div>'
+    '</div>'
+).format
+
+# Smallest current change (A) from the current editor that triggers a cell update
+CURRENT_EPSILON = 1e-3
+
+# Analytics bar charts: metric column -> chart title (filled row by row in a 2x2 grid)
+ANALYTICS_CHARTS = {
+    'Voltage': 'Cell Voltages',
+    'SOC': 'State of Charge (%)',
+    'Current': 'Cell Currents (A)',
+    'Temperature': 'Cell Temperatures (°C)',
+}
+
+# Analytics tables kept in the server-wide st.cache_data store (shared by all sessions)
+ANALYTICS_CACHE_ENTRIES = 64
+
+# Most recent task history entries kept per session
+TASK_HISTORY_LIMIT = 500
+
+@st.cache_resource
+def _inject_css():
+    """Emit the custom CSS (cached, replayed on reruns)"""
+    st.markdown(_CSS, unsafe_allow_html=True)
+
+@dataclass
+class CellArrays:
+    """Cell state as one array per field, indexed by cell position"""
+    voltage: np.ndarray
+    current: np.ndarray
+    temp: np.ndarray
+    capacity: np.ndarray
+    min_voltage: np.ndarray
+    max_voltage: np.ndarray
+    nominal_voltage: np.ndarray
+    nominal_capacity: np.ndarray
+    soc: np.ndarray
+    cell_type: np.ndarray
 
 def initialize_session_state():
     """Initialize session state variables"""
-    if 'cells_data' not in st.session_state:
-        st.session_state.cells_data = {}
+    if 'cells' not in st.session_state:
+        st.session_state.cells = None
+    if 'cell_names' not in st.session_state:
+        st.session_state.cell_names = []
+    if 'current_editor_rev' not in st.session_state:
+        st.session_state.current_editor_rev = 0
     if 'cell_types' not in st.session_state:
         st.session_state.cell_types = []
     if 'history' not in st.session_state:
@@ -101,52 +218,28 @@ def initialize_session_state():
     if 'task_start_time' not in st.session_state:
         st.session_state.task_start_time = None
     if 'task_history' not in st.session_state:
-        st.session_state.task_history = []
+        st.session_state.task_history = deque(maxlen=TASK_HISTORY_LIMIT)
+        st.session_state.task_history_count = 0
+    if 'task_history_df' not in st.session_state:
+        st.session_state.task_history_df = None
 
+@functools.lru_cache(maxsize=4)
 def get_cell_specs(cell_type):
     """Get cell specifications based on type"""
-    if cell_type.lower() == "lfp":
-        return {
-            "nominal_voltage": 3.2,
-            "min_voltage": 2.8,
-            "max_voltage": 3.6,
-            "nominal_capacity": 100  # Ah
-        }
-    elif cell_type.lower() == "nmc":
-        return {
-            "nominal_voltage": 3.6,
-            "min_voltage": 3.2,
-            "max_voltage": 4.0,
-            "nominal_capacity": 120  # Ah
-        }
-    else:
-        return {
-            "nominal_voltage": 3.7,
-            "min_voltage": 3.0,
-            "max_voltage": 4.2,
-            "nominal_capacity": 110  # Ah
-        }
+    return CELL_SPECS.get(cell_type.lower(), DEFAULT_SPECS)
 
 def calculate_soc_percentage(voltage, min_voltage, max_voltage):
-    """Calculate State of Charge percentage based on voltage"""
-    return max(0, min(100, ((voltage - min_voltage) / (max_voltage - min_voltage)) * 100))
+    """Calculate State of Charge percentage based on voltage (scalars or arrays)"""
+    return np.clip((np.asarray(voltage) - min_voltage) / (max_voltage - min_voltage) * 100.0, 0.0, 100.0)
 
-def get_cell_status(current, task_running=False):
-    """Determine cell status based on current"""
+def classify_cells(current, task_running=False):
+    """Determine status label and status class for every cell based on current"""
+    codes = np.full(current.shape, 2)  # idle
+    codes[current > 0.1] = 0
+    codes[current < -0.1] = 1
     if task_running:
-        if current > 0.1:
-            return "Task: Charging", "task"
-        elif current < -0.1:
-            return "Task: Discharging", "task"
-        else:
-            return "Task: Idle", "task"
-    else:
-        if current > 0.1:
-            return "Charging", "charging"
-        elif current < -0.1:
-            return "Discharging", "discharging"
-        else:
-            return "Idle", "idle"
+        return np.char.add("Task: ", _STATUS_LABELS[codes]), np.full(codes.shape, "task")
+    return _STATUS_LABELS[codes], _STATUS_CLASSES[codes]
 
 def setup_cells():
     """Setup cells configuration"""
@@ -177,10 +270,11 @@ def setup_cells():
             cell_types.append(cell_type)
     
     if st.button("Initialize Cells", type="primary"):
-        cells_data = {}
+        cells_data = []
+        cell_names = []
         
         for idx, cell_type in enumerate(cell_types, start=1):
-            cell_key = f"cell_{idx}_{cell_type.lower()}"
+            cell_names.append(f"Cell {idx} {cell_type.title()}")
             specs = get_cell_specs(cell_type)
             
             # Initialize with random values
@@ -188,9 +282,9 @@ def setup_cells():
             current = 0.0
             temp = round(random.uniform(25, 40), 1)
             capacity = round(voltage * abs(current), 2)
-            soc = calculate_soc_percentage(voltage, specs["min_voltage"], specs["max_voltage"])
+            soc = float(calculate_soc_percentage(voltage, specs["min_voltage"], specs["max_voltage"]))
             
-            cells_data[cell_key] = {
+            cells_data.append({
                 "voltage": voltage,
                 "current": current,
                 "temp": temp,
@@ -201,9 +295,19 @@ def setup_cells():
                 "nominal_capacity": specs["nominal_capacity"],
                 "soc": soc,
                 "cell_type": cell_type.upper()
-            }
+            })
         
-        st.session_state.cells_data = cells_data
+        # Store cells as parallel arrays (one array per field)
+        st.session_state.cells = CellArrays(**{
+            field.name: np.array(
+                [cell[field.name] for cell in cells_data],
+                dtype=str if field.name == "cell_type" else float
+            )
+            for field in fields(CellArrays)
+        })
+        # Display names are built once here; everything else indexes the arrays
+        st.session_state.cell_names = cell_names
+        reset_current_editor()
         st.session_state.cell_types = cell_types
         st.session_state.setup_complete = True
         st.success(f"Successfully initialized {num_cells} cells!")
@@ -216,10 +320,11 @@ def display_cell_cards():
     # Summary metrics
     col1, col2, col3, col4 = st.columns(4)
     
-    total_cells = len(st.session_state.cells_data)
-    charging_cells = sum(1 for cell in st.session_state.cells_data.values() if cell['current'] > 0.1)
-    discharging_cells = sum(1 for cell in st.session_state.cells_data.values() if cell['current'] < -0.1)
-    avg_temp = sum(cell['temp'] for cell in st.session_state.cells_data.values()) / total_cells if total_cells > 0 else 0
+    arr = st.session_state.cells
+    total_cells = len(arr.current)
+    charging_cells = int((arr.current > 0.1).sum())
+    discharging_cells = int((arr.current < -0.1).sum())
+    avg_temp = float(arr.temp.mean()) if total_cells > 0 else 0
     
     with col1:
         st.metric("Total Cells", total_cells)
@@ -237,47 +342,35 @@ def display_cell_cards():
     # Cell cards
     st.subheader("Individual Cell Status")
     
-    # Create columns for cards (4 cards per row)
-    cells_list = list(st.session_state.cells_data.items())
-    rows = [cells_list[i:i+4] for i in range(0, len(cells_list), 4)]
-    
-    for row in rows:
-        cols = st.columns(len(row))
-        
-        for idx, (cell_key, cell_data) in enumerate(row):
-            with cols[idx]:
-                status, status_class = get_cell_status(cell_data['current'], st.session_state.task_running)
-                
-                # Determine card style based on status
-                if status_class == "task":
-                    card_class = "task-running-card"
-                    badge_class = "task-badge"
-                elif status_class == "charging":
-                    card_class = "charging-card"
-                    badge_class = "charging-badge"
-                elif status_class == "discharging":
-                    card_class = "discharging-card"
-                    badge_class = "discharging-badge"
-                else:
-                    card_class = "idle-card"
-                    badge_class = "idle-badge"
-                
-                # Create card content
-                st.markdown(f"""
-                <div class="{card_class}">
-                    <h4 style="margin-top: 0;">{cell_key.replace('_', ' ').title()}</h4>
-                    <span class="status-badge {badge_class}">{status}</span>
-                    <hr style="border-color: rgba(255,255,255,0.3);">
-                    <p><strong>Voltage:</strong> {cell_data['voltage']:.2f}V</p>
-                    <p><strong>Current:</strong> {cell_data['current']:.2f}A</p>
-                    <p><strong>Temperature:</strong> {cell_data['temp']:.1f}°C</p>
-                    <p><strong>SOC:</strong> {cell_data['soc']:.1f}%</p>
-                    <p><strong>Capacity:</strong> {cell_data['capacity']:.2f}Wh</p>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                # Progress bar for SOC
-                st.progress(cell_data['soc'] / 100)
+    # Status of all cells at once
+    statuses, status_classes = classify_cells(arr.current, st.session_state.task_running)
+    
+    # Format each value column in one vectorized pass, then fill the card template
+    voltage = np.char.mod('%.2f', arr.voltage)
+    current = np.char.mod('%.2f', arr.current)
+    temp = np.char.mod('%.1f', arr.temp)
+    soc = np.char.mod('%.1f', arr.soc)
+    capacity = np.char.mod('%.2f', arr.capacity)
+    names = st.session_state.cell_names
+    
+    # All cards go out as a single HTML grid (4 cards per row)
+    cards = "".join(
+        _CARD_TMPL(
+            card_class=_CARD_STYLES[status_classes[i]][0],
+            badge_class=_CARD_STYLES[status_classes[i]][1],
+            name=names[i], status=statuses[i],
+            voltage=voltage[i], current=current[i], temp=temp[i],
+            soc=soc[i], capacity=capacity[i]
+        )
+        for i in range(total_cells)
+    )
+    st.markdown(f'<div class="cell-grid">{cards}</div>', unsafe_allow_html=True)
+
+def reset_current_editor():
+    """Discard pending edits in the current grid (call after replacing all currents)"""
+    # The grid keeps its edits while its key and columns stay the same, even when the
+    # values change, so a new key is the only way to stop them being re-applied
+    st.session_state.current_editor_rev += 1
 
 def control_panel():
     """Control panel for updating cell values"""
@@ -286,62 +379,55 @@ def control_panel():
     with st.expander("Manual Current Control", expanded=True):
         st.subheader("Set Current Values")
         
-        # Quick preset buttons
+        # Quick preset buttons (the click's own rerun redraws everything below them)
         col1, col2, col3, col4 = st.columns(4)
         with col1:
             if st.button("🔋 Start Charging (+2A)"):
-                for cell_key in st.session_state.cells_data:
-                    st.session_state.cells_data[cell_key]['current'] = 2.0
-                    update_cell_calculations(cell_key)
-                st.rerun()
+                _apply_current_to_all(2.0)
         
         with col2:
             if st.button("⚡ Fast Charge (+5A)"):
-                for cell_key in st.session_state.cells_data:
-                    st.session_state.cells_data[cell_key]['current'] = 5.0
-                    update_cell_calculations(cell_key)
-                st.rerun()
+                _apply_current_to_all(5.0)
         
         with col3:
             if st.button("🔻 Discharge (-2A)"):
-                for cell_key in st.session_state.cells_data:
-                    st.session_state.cells_data[cell_key]['current'] = -2.0
-                    update_cell_calculations(cell_key)
-                st.rerun()
+                _apply_current_to_all(-2.0)
         
         with col4:
             if st.button("⏸️ Stop All (0A)"):
-                for cell_key in st.session_state.cells_data:
-                    st.session_state.cells_data[cell_key]['current'] = 0.0
-                    update_cell_calculations(cell_key)
-                st.rerun()
+                _apply_current_to_all(0.0)
         
         st.divider()
         
-        # Individual cell controls
+        # Individual cell controls (one editable grid for all cells)
         st.subheader("Individual Cell Controls")
-        cells_per_row = 4
-        cell_keys = list(st.session_state.cells_data.keys())
+        arr = st.session_state.cells
+        edited = st.data_editor(
+            pd.DataFrame(
+                {'current': arr.current},
+                index=pd.Index(st.session_state.cell_names, name='Cell')
+            ),
+            num_rows="fixed",
+            key=f"current_editor_{st.session_state.current_editor_rev}",
+            column_config={
+                'current': st.column_config.NumberColumn(
+                    "Current (A)",
+                    min_value=-10.0,
+                    max_value=10.0,
+                    step=0.1,
+                    required=True,
+                    help="Positive = Charging, Negative = Discharging"
+                )
+            },
+            use_container_width=True
+        )
         
-        for i in range(0, len(cell_keys), cells_per_row):
-            cols = st.columns(cells_per_row)
-            row_cells = cell_keys[i:i+cells_per_row]
-            
-            for idx, cell_key in enumerate(row_cells):
-                with cols[idx]:
-                    current_val = st.number_input(
-                        f"{cell_key.replace('_', ' ').title()}",
-                        min_value=-10.0,
-                        max_value=10.0,
-                        value=st.session_state.cells_data[cell_key]['current'],
-                        step=0.1,
-                        key=f"current_{cell_key}",
-                        help="Positive = Charging, Negative = Discharging"
-                    )
-                    
-                    if current_val != st.session_state.cells_data[cell_key]['current']:
-                        st.session_state.cells_data[cell_key]['current'] = current_val
-                        update_cell_calculations(cell_key)
+        # Apply all changed currents in one update
+        new_currents = edited['current'].to_numpy(dtype=float)
+        changed = np.abs(new_currents - arr.current) > CURRENT_EPSILON
+        if changed.any():
+            arr.current[changed] = new_currents[changed]
+            _recompute_all(arr, mask=changed)
 
 def task_management():
     """Task management page"""
@@ -428,12 +514,17 @@ def task_management():
     if st.session_state.tasks_data:
         st.subheader("Current Task Sequence")
         
-        # Display tasks in a nice format
-        for task_key, task_data in st.session_state.tasks_data.items():
-            with st.expander(f"{task_key.replace('_', ' ').title()} - {task_data['task_type']}", expanded=False):
-                st.json(task_data)
+        # One table row per task; the per-task JSON view is opt-in
+        if st.checkbox("Detailed view", key="tasks_detailed_view"):
+            for task_key, task_data in st.session_state.tasks_data.items():
+                with st.expander(f"{task_key.replace('_', ' ').title()} - {task_data['task_type']}", expanded=False):
+                    st.json(task_data)
+        else:
+            tasks_df = pd.DataFrame.from_dict(st.session_state.tasks_data, orient='index')
+            st.dataframe(tasks_df, use_container_width=True)
         
-        # Task control buttons
+        # Task control buttons. These rerun explicitly: the sidebar task status and the
+        # Start/Pause disabled states were already drawn from the old task state.
         st.subheader("Task Control")
         col1, col2, col3 = st.columns(3)
         
@@ -468,9 +559,20 @@ def task_management():
     # Task history
     if st.session_state.task_history:
         st.subheader("📊 Task History")
-        history_df = pd.DataFrame(st.session_state.task_history)
+        history_df = get_task_history_df()
         st.dataframe(history_df, use_container_width=True)
 
+def get_task_history_df():
+    """Task history DataFrame, rebuilt only after a new entry is logged"""
+    # Kept in session state next to the deque, keyed on the running count of logged
+    # entries (the deque length stops changing once the ring buffer is full)
+    count = st.session_state.task_history_count
+    cached = st.session_state.task_history_df
+    if cached is None or cached[0] != count:
+        cached = (count, pd.DataFrame(list(st.session_state.task_history)))
+        st.session_state.task_history_df = cached
+    return cached[1]
+
 def start_task_sequence():
     """Start the task sequence"""
     if not st.session_state.tasks_data:
@@ -479,7 +581,7 @@ def start_task_sequence():
     
     st.session_state.task_running = True
     st.session_state.current_task_index = 0
-    st.session_state.task_start_time = datetime.now()
+    st.session_state.task_start_time = time.monotonic()
     
     # Start the first task
     execute_current_task()
@@ -509,138 +611,217 @@ def execute_current_task():
         "type": task_data['task_type'],
         "status": "started"
     })
+    st.session_state.task_history_count += 1
 
 def apply_cc_cv_task(task_data):
     """Apply CC_CV task to all cells"""
-    for cell_key in st.session_state.cells_data:
-        # Set charging current
-        st.session_state.cells_data[cell_key]['current'] = task_data.get('cc_current', 2.0)
-        update_cell_calculations(cell_key)
+    # Set charging current
+    _apply_current_to_all(task_data.get('cc_current', 2.0))
 
 def apply_idle_task(task_data):
     """Apply IDLE task to all cells"""
-    for cell_key in st.session_state.cells_data:
-        # Set current to 0
-        st.session_state.cells_data[cell_key]['current'] = 0.0
-        update_cell_calculations(cell_key)
+    # Set current to 0
+    _apply_current_to_all(0.0)
 
 def apply_cc_cd_task(task_data):
     """Apply CC_CD task to all cells"""
-    for cell_key in st.session_state.cells_data:
-        # Set discharging current
-        st.session_state.cells_data[cell_key]['current'] = task_data.get('cc_current', -2.0)
-        update_cell_calculations(cell_key)
+    # Set discharging current
+    _apply_current_to_all(task_data.get('cc_current', -2.0))
 
 def stop_all_tasks():
     """Stop all tasks and reset cells"""
     st.session_state.task_running = False
     st.session_state.current_task_index = 0
     
-    for cell_key in st.session_state.cells_data:
-        st.session_state.cells_data[cell_key]['current'] = 0.0
-        update_cell_calculations(cell_key)
-
-def update_cell_calculations(cell_key):
-    """Update cell calculations based on current"""
-    cell_data = st.session_state.cells_data[cell_key]
-    
-    # Update capacity (simplified calculation)
-    cell_data['capacity'] = round(cell_data['voltage'] * abs(cell_data['current']), 2)
-    
-    # Simulate voltage change based on current (simplified model)
-    if cell_data['current'] > 0:  # Charging
-        voltage_change = min(0.1, cell_data['current'] * 0.02)
-        cell_data['voltage'] = min(cell_data['max_voltage'], 
-                                 cell_data['voltage'] + voltage_change)
-    elif cell_data['current'] < 0:  # Discharging
-        voltage_change = min(0.1, abs(cell_data['current']) * 0.02)
-        cell_data['voltage'] = max(cell_data['min_voltage'], 
-                                 cell_data['voltage'] - voltage_change)
-    
-    # Update SOC
-    cell_data['soc'] = calculate_soc_percentage(
-        cell_data['voltage'], 
-        cell_data['min_voltage'], 
-        cell_data['max_voltage']
-    )
-    
-    # Simulate temperature change
-    if abs(cell_data['current']) > 1:
-        temp_change = random.uniform(-1, 2)
-        cell_data['temp'] = max(20, min(60, cell_data['temp'] + temp_change))
+    _apply_current_to_all(0.0)
+
+def _update_cells_kernel(voltage, current, temp, capacity, soc,
+                         min_voltage, max_voltage, temp_noise):
+    """Per-cell update loop over raw arrays (in place), compiled with numba"""
+    for k in range(voltage.shape[0]):
+        # Update capacity (simplified calculation)
+        capacity[k] = voltage[k] * abs(current[k])
+        
+        # Simulate voltage change based on current, capped at 0.1V per update
+        voltage_change = min(0.1, abs(current[k]) * 0.02)
+        if current[k] > 0:
+            voltage[k] = min(max_voltage[k], voltage[k] + voltage_change)
+        elif current[k] < 0:
+            voltage[k] = max(min_voltage[k], voltage[k] - voltage_change)
+        
+        # Update SOC
+        level = (voltage[k] - min_voltage[k]) / (max_voltage[k] - min_voltage[k]) * 100.0
+        soc[k] = min(100.0, max(0.0, level))
+        
+        # Simulate temperature change
+        if abs(current[k]) > 1.0:
+            temp[k] = min(60.0, max(20.0, temp[k] + temp_noise[k]))
+
+@st.cache_resource
+def _compiled_update_kernel():
+    """JIT-compile the cell update kernel once per process (None without numba)"""
+    if njit is None:
+        return None
+    kernel = njit(cache=True, fastmath=True)(_update_cells_kernel)
+    # Warm up with one dummy cell so the first real update is not charged the compile
+    one, zero = np.ones(1), np.zeros(1)
+    kernel(one.copy(), one, one.copy(), one.copy(), one.copy(), zero, one + 1, zero)
+    return kernel
+
+def _recompute_all(arr, mask=None):
+    """Update calculations for the selected cells (all by default) based on current"""
+    sel = slice(None) if mask is None else mask
+    current = arr.current[sel]
+    voltage = arr.voltage[sel]
+    min_voltage = arr.min_voltage[sel]
+    max_voltage = arr.max_voltage[sel]
+    temp = arr.temp[sel]
+    # Random draws stay outside the kernel so both paths share the same noise
+    temp_noise = np.random.uniform(-1, 2, size=len(current))
+    
+    kernel = _compiled_update_kernel()
+    if kernel is not None:
+        voltage = np.ascontiguousarray(voltage)
+        temp = np.ascontiguousarray(temp)
+        capacity = np.empty_like(voltage)
+        soc = np.empty_like(voltage)
+        kernel(voltage, np.ascontiguousarray(current), temp, capacity, soc,
+               np.ascontiguousarray(min_voltage), np.ascontiguousarray(max_voltage), temp_noise)
+    else:
+        # Update capacity (simplified calculation)
+        capacity = voltage * np.abs(current)
+        
+        # Simulate voltage change based on current (simplified model)
+        voltage_change = np.minimum(0.1, np.abs(current) * 0.02)
+        voltage = np.where(current > 0, np.minimum(max_voltage, voltage + voltage_change),
+                  np.where(current < 0, np.maximum(min_voltage, voltage - voltage_change), voltage))
+        
+        # Update SOC
+        soc = calculate_soc_percentage(voltage, min_voltage, max_voltage)
+        
+        # Simulate temperature change
+        hot = np.abs(current) > 1
+        temp[hot] = np.clip(temp[hot] + temp_noise[hot], 20, 60)
+    
+    arr.capacity[sel] = np.round(capacity, 2)
+    arr.voltage[sel] = voltage
+    arr.soc[sel] = soc
+    arr.temp[sel] = temp
+
+def _apply_current_to_all(value):
+    """Set the same current on every cell and update them all in one pass"""
+    arr = st.session_state.cells
+    arr.current[:] = value
+    _recompute_all(arr)
+    reset_current_editor()
+
+def cells_fingerprint():
+    """Cheap fingerprint of the cell values shown on the analytics page"""
+    arr = st.session_state.cells
+    return b"".join([
+        "|".join(st.session_state.cell_names).encode(),
+        arr.voltage.tobytes(),
+        arr.current.tobytes(),
+        arr.temp.tobytes(),
+        arr.soc.tobytes(),
+        arr.capacity.tobytes(),
+    ])
+
+@st.cache_data(show_spinner=False, max_entries=ANALYTICS_CACHE_ENTRIES)
+def _build_analytics_df(fingerprint, _arr, _cell_names):
+    """Build the analytics DataFrame (cached per fingerprint)"""
+    return pd.DataFrame({
+        'Cell': _cell_names,
+        'Voltage': _arr.voltage,
+        'Current': _arr.current,
+        'Temperature': _arr.temp,
+        'SOC': _arr.soc,
+        'Capacity': _arr.capacity,
+        'Type': _arr.cell_type
+    })
+
+def _build_analytics_figure(df):
+    """Build all analytics bar charts as one 2x2 figure (a trace per metric and cell type)"""
+    fig = make_subplots(rows=2, cols=2, subplot_titles=list(ANALYTICS_CHARTS.values()),
+                        vertical_spacing=0.2)
+    palette = px.colors.qualitative.Plotly
+    cell_types = df['Type'].unique()
+    for k, metric in enumerate(ANALYTICS_CHARTS):
+        for j, cell_type in enumerate(cell_types):
+            sub = df[df['Type'] == cell_type]
+            fig.add_trace(
+                go.Bar(
+                    x=sub['Cell'], y=sub[metric], name=cell_type, meta=metric,
+                    legendgroup=cell_type, showlegend=k == 0,
+                    marker_color=palette[j % len(palette)]
+                ),
+                row=k // 2 + 1, col=k % 2 + 1
+            )
+    fig.update_layout(height=800, barmode='relative', legend_title_text='Type')
+    fig.update_xaxes(tickangle=-45)
+    return fig
+
+def _update_analytics_figure(fig, df):
+    """Refresh the bars of the analytics figure in place from the analytics DataFrame"""
+    for trace in fig.data:
+        sub = df[df['Type'] == trace.name]
+        trace.x = sub['Cell']
+        trace.y = sub[trace.meta]
+
+def get_analytics_figure(df):
+    """Analytics figure for this session, built once per cell setup and updated in place"""
+    names_key = tuple(st.session_state.cell_names)
+    cached = st.session_state.get('analytics_fig')
+    if cached is None or cached[0] != names_key:
+        fig = _build_analytics_figure(df)
+        st.session_state.analytics_fig = (names_key, fig)
+        return fig
+    
+    fig = cached[1]
+    _update_analytics_figure(fig, df)
+    return fig
 
 def analytics_dashboard():
     """Analytics and visualization dashboard"""
     st.header("📈 Analytics Dashboard")
     
-    if not st.session_state.cells_data:
+    if not st.session_state.cell_names:
         st.warning("No cell data available. Please initialize cells first.")
         return
     
-    # Create DataFrame for easier plotting
-    df_data = []
-    for cell_key, cell_data in st.session_state.cells_data.items():
-        df_data.append({
-            'Cell': cell_key.replace('_', ' ').title(),
-            'Voltage': cell_data['voltage'],
-            'Current': cell_data['current'],
-            'Temperature': cell_data['temp'],
-            'SOC': cell_data['soc'],
-            'Capacity': cell_data['capacity'],
-            'Type': cell_data['cell_type']
-        })
-    
-    df = pd.DataFrame(df_data)
+    # DataFrame is cached until a cell value changes; the figure persists per session
+    fp = cells_fingerprint()
+    df = _build_analytics_df(fp, st.session_state.cells, st.session_state.cell_names)
     
-    # Charts
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        # Voltage comparison
-        fig_voltage = px.bar(df, x='Cell', y='Voltage', color='Type',
-                           title='Cell Voltages', height=400)
-        fig_voltage.update_layout(xaxis_tickangle=-45)
-        st.plotly_chart(fig_voltage, use_container_width=True)
-        
-        # Current comparison
-        fig_current = px.bar(df, x='Cell', y='Current', color='Type',
-                           title='Cell Currents (A)', height=400)
-        fig_current.update_layout(xaxis_tickangle=-45)
-        st.plotly_chart(fig_current, use_container_width=True)
-    
-    with col2:
-        # SOC comparison
-        fig_soc = px.bar(df, x='Cell', y='SOC', color='Type',
-                        title='State of Charge (%)', height=400)
-        fig_soc.update_layout(xaxis_tickangle=-45)
-        st.plotly_chart(fig_soc, use_container_width=True)
-        
-        # Temperature comparison
-        fig_temp = px.bar(df, x='Cell', y='Temperature', color='Type',
-                         title='Cell Temperatures (°C)', height=400)
-        fig_temp.update_layout(xaxis_tickangle=-45)
-        st.plotly_chart(fig_temp, use_container_width=True)
+    # Voltage, current, SOC and temperature charts in a single figure
+    st.plotly_chart(get_analytics_figure(df), use_container_width=True)
     
     # Summary table
     st.subheader("📋 Detailed Data Table")
     st.dataframe(df, use_container_width=True, hide_index=True)
 
+# Compile the numba kernel (if available) before the first cell update
+_compiled_update_kernel()
+
 def main():
     """Main application function"""
+    _inject_css()
     initialize_session_state()
     
     # Auto-update task execution
     if st.session_state.task_running:
         # Simple task progression logic (you can enhance this)
-        if st.session_state.task_start_time:
-            elapsed = (datetime.now() - st.session_state.task_start_time).seconds
+        # Monotonic fractional seconds, unaffected by wall-clock jumps
+        if st.session_state.task_start_time is not None:
+            now = time.monotonic()
+            elapsed = now - st.session_state.task_start_time
             current_task_key = f"task_{st.session_state.current_task_index + 1}"
             current_task = st.session_state.tasks_data.get(current_task_key, {})
             
             if elapsed >= current_task.get('time_seconds', 60):
                 # Move to next task
                 st.session_state.current_task_index += 1
-                st.session_state.task_start_time = datetime.now()
+                st.session_state.task_start_time = now
                 
                 if st.session_state.current_task_index >= len(st.session_state.tasks_data):
                     # All tasks completed
@@ -658,11 +839,10 @@ def main():
         ["Setup", "Dashboard", "Control Panel", "Tasks", "Analytics"]
     )
     
-    # Auto-refresh option
+    # Auto-refresh option (browser-side timer, does not block the script thread)
     auto_refresh = st.sidebar.checkbox("Auto Refresh (2s)", value=False)
     if auto_refresh:
-        time.sleep(2)
-        st.rerun()
+        st_autorefresh(interval=2000, limit=None, key="refresh")
     
     # Task status in sidebar
     if st.session_state.task_running: